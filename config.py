@@ -52,6 +52,8 @@ POSTGRES_USER = get_env_variable("POSTGRES_USER", "myuser")
 POSTGRES_PASSWORD = get_env_variable("POSTGRES_PASSWORD", "mypassword")
 DB_HOST = get_env_variable("DB_HOST", "db")
 DB_PORT = get_env_variable("DB_PORT", "5432")
+POSTGRES_POOL_MIN_SIZE = int(get_env_variable("POSTGRES_POOL_MIN_SIZE", "10"))
+POSTGRES_POOL_MAX_SIZE = int(get_env_variable("POSTGRES_POOL_MAX_SIZE", "10"))
 COLLECTION_NAME = get_env_variable("COLLECTION_NAME", "testcollection")
 ATLAS_MONGO_DB_URI = get_env_variable(
     "ATLAS_MONGO_DB_URI", "mongodb://127.0.0.1:27018/LibreChat"
@@ -138,18 +140,21 @@ class LogMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request, call_next):
         response = await call_next(request)
 
-        logger_method = logger.info
+        log_level = logging.INFO
 
-        if str(request.url).endswith("/health"):
-            logger_method = logger.debug
+        if request.url.path == "/health":
+            log_level = logging.DEBUG
 
-        logger_method(
-            f"Request {request.method} {request.url} - {response.status_code}",
-            extra={
-                HTTP_REQ: {"method": request.method, "url": str(request.url)},
-                HTTP_RES: {"status_code": response.status_code},
-            },
-        )
+        # Skip building the message and `extra` dicts when they'd be dropped
+        if logger.isEnabledFor(log_level):
+            logger.log(
+                log_level,
+                f"Request {request.method} {request.url} - {response.status_code}",
+                extra={
+                    HTTP_REQ: {"method": request.method, "url": str(request.url)},
+                    HTTP_RES: {"status_code": response.status_code},
+                },
+            )
 
         return response
 
@@ -287,47 +292,49 @@ else:
 
 retriever = vector_store.as_retriever()
 
-known_source_ext = [
-    "go",
-    "py",
-    "java",
-    "sh",
-    "bat",
-    "ps1",
-    "cmd",
-    "js",
-    "ts",
-    "css",
-    "cpp",
-    "hpp",
-    "h",
-    "c",
-    "cs",
-    "sql",
-    "log",
-    "ini",
-    "pl",
-    "pm",
-    "r",
-    "dart",
-    "dockerfile",
-    "env",
-    "php",
-    "hs",
-    "hsc",
-    "lua",
-    "nginxconf",
-    "conf",
-    "m",
-    "mm",
-    "plsql",
-    "perl",
-    "rb",
-    "rs",
-    "db2",
-    "scala",
-    "bash",
-    "swift",
-    "vue",
-    "svelte",
-]
+known_source_ext = frozenset(
+    [
+        "go",
+        "py",
+        "java",
+        "sh",
+        "bat",
+        "ps1",
+        "cmd",
+        "js",
+        "ts",
+        "css",
+        "cpp",
+        "hpp",
+        "h",
+        "c",
+        "cs",
+        "sql",
+        "log",
+        "ini",
+        "pl",
+        "pm",
+        "r",
+        "dart",
+        "dockerfile",
+        "env",
+        "php",
+        "hs",
+        "hsc",
+        "lua",
+        "nginxconf",
+        "conf",
+        "m",
+        "mm",
+        "plsql",
+        "perl",
+        "rb",
+        "rs",
+        "db2",
+        "scala",
+        "bash",
+        "swift",
+        "vue",
+        "svelte",
+    ]
+)
@@ -1,8 +1,9 @@
 import os
-import hashlib
-import aiofiles
+import asyncio
 import aiofiles.os
-from typing import Iterable, List
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Iterable, List
 from shutil import copyfileobj
 import traceback
 
@@ -10,7 +11,7 @@ import uvicorn
 from langchain.schema import Document
 from contextlib import asynccontextmanager
 from dotenv import find_dotenv, load_dotenv
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from langchain_core.runnables.config import run_in_executor
@@ -45,12 +46,13 @@ from models import (
     QueryRequestBody,
     DocumentResponse,
     QueryMultipleBody,
+    generate_digest,
 )
 from psql import PSQLDatabase, ensure_custom_id_index_on_embedding, pg_health_check
 from pgvector_routes import router as pgvector_router
 from parsers import process_documents, clean_text
 from middleware import security_middleware
-from mongo import mongo_health_check
+from mongo import MongoDatabase, mongo_health_check
 from constants import ERROR_MESSAGES
 from store import AsyncPgVector
 
@@ -79,12 +81,22 @@ from config import (
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic goes here
-    if VECTOR_DB_TYPE == "pgvector":
+    if VECTOR_DB_TYPE == VectorDBType.PGVECTOR:
         await PSQLDatabase.get_pool()  # Initialize the pool
-        await ensure_custom_id_index_on_embedding()
+        # Building the index on a large table can take minutes; don't block startup
+        index_task = asyncio.create_task(ensure_custom_id_index_on_embedding())
 
     yield
 
+    # Shutdown logic goes here
+    if VECTOR_DB_TYPE == VectorDBType.PGVECTOR:
+        if not index_task.done():
+            index_task.cancel()
+            await asyncio.gather(index_task, return_exceptions=True)
+        await PSQLDatabase.close_pool()
+    elif VECTOR_DB_TYPE == VectorDBType.ATLAS_MONGO:
+        MongoDatabase.close_client()
+
 
 app = FastAPI(lifespan=lifespan, debug=debug_mode)
 
@@ -113,7 +125,7 @@ async def get_all_ids():
         else:
             ids = vector_store.get_all_ids()
 
-        return list(set(ids))
+        return ids
     except Exception as e:
         logger.error(
             "Failed to get all IDs | Error: %s | Traceback: %s",
@@ -132,11 +144,14 @@ def isHealthOK():
         return True
 
 
+HEALTH_UP_RESPONSE = b'{"status":"UP"}'
+
+
 @app.get("/health")
 async def health_check():
     try:
         if await isHealthOK():
-            return {"status": "UP"}
+            return Response(content=HEALTH_UP_RESPONSE, media_type="application/json")
         else:
             logger.error("Health check failed")
             return {"status": "DOWN"}, 503
@@ -153,14 +168,15 @@ async def health_check():
 async def get_documents_by_ids(ids: list[str] = Query(...)):
     try:
         if isinstance(vector_store, AsyncPgVector):
-            existing_ids = await vector_store.get_all_ids()
-            documents = await vector_store.get_documents_by_ids(ids)
+            existing_ids, documents = await asyncio.gather(
+                vector_store.get_all_ids(), vector_store.get_documents_by_ids(ids)
+            )
         else:
             existing_ids = vector_store.get_all_ids()
             documents = vector_store.get_documents_by_ids(ids)
 
         # Ensure all requested ids exist
-        if not all(id in existing_ids for id in ids):
+        if not set(ids).issubset(existing_ids):
             raise HTTPException(status_code=404, detail="One or more IDs not found")
 
         # Ensure documents list is not empty
@@ -197,7 +213,7 @@ async def delete_documents(document_ids: List[str] = Body(...)):
             existing_ids = vector_store.get_all_ids()
             vector_store.delete(ids=document_ids)
 
-        if not all(id in existing_ids for id in document_ids):
+        if not set(document_ids).issubset(existing_ids):
             raise HTTPException(status_code=404, detail="One or more IDs not found")
 
         file_count = len(document_ids)
@@ -214,6 +230,28 @@ async def delete_documents(document_ids: List[str] = Body(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+QUERY_EMBEDDING_CACHE_SIZE = 128
+_query_embedding_cache = OrderedDict()
+_query_embedding_cache_lock = threading.Lock()
+
+
+def get_cached_query_embedding(query: str):
+    # Queries that differ only in whitespace share one cache entry, but the
+    # provider is always sent the query exactly as the client wrote it
+    key = " ".join(query.split())
+    with _query_embedding_cache_lock:
+        if key in _query_embedding_cache:
+            _query_embedding_cache.move_to_end(key)
+            return _query_embedding_cache[key]
+    embedding = vector_store.embedding_function.embed_query(query)
+    with _query_embedding_cache_lock:
+        _query_embedding_cache[key] = embedding
+        _query_embedding_cache.move_to_end(key)
+        if len(_query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+            _query_embedding_cache.popitem(last=False)
+    return embedding
+
+
 @app.post("/query")
 async def query_embeddings_by_file_id(
     body: QueryRequestBody,
@@ -229,7 +267,7 @@ async def query_embeddings_by_file_id(
     authorized_documents = []
 
     try:
-        embedding = vector_store.embedding_function.embed_query(body.query)
+        embedding = await run_in_executor(None, get_cached_query_embedding, body.query)
 
         if isinstance(vector_store, AsyncPgVector):
             documents = await run_in_executor(
@@ -286,17 +324,12 @@ async def query_embeddings_by_file_id(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def generate_digest(page_content: str):
-    hash_obj = hashlib.md5(page_content.encode())
-    return hash_obj.hexdigest()
-
-
-async def store_data_in_vector_db(
+def prepare_documents(
     data: Iterable[Document],
     file_id: str,
     user_id: str = "",
     clean_content: bool = False,
-) -> bool:
+) -> List[Document]:
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=app.state.CHUNK_SIZE, chunk_overlap=app.state.CHUNK_OVERLAP
     )
@@ -308,7 +341,7 @@ async def store_data_in_vector_db(
             doc.page_content = clean_text(doc.page_content)
 
     # Preparing documents with page content and metadata for insertion.
-    docs = [
+    return [
         Document(
             page_content=doc.page_content,
             metadata={
@@ -321,13 +354,23 @@ async def store_data_in_vector_db(
         for doc in documents
     ]
 
+
+async def store_data_in_vector_db(
+    data: Iterable[Document],
+    file_id: str,
+    user_id: str = "",
+    clean_content: bool = False,
+) -> bool:
+    # Splitting, cleaning and hashing are CPU-bound; keep them off the event loop
+    docs = await run_in_executor(
+        None, prepare_documents, data, file_id, user_id, clean_content
+    )
+
     try:
         if isinstance(vector_store, AsyncPgVector):
-            ids = await vector_store.aadd_documents(
-                docs, ids=[file_id] * len(documents)
-            )
+            ids = await vector_store.aadd_documents(docs, ids=[file_id] * len(docs))
         else:
-            ids = vector_store.add_documents(docs, ids=[file_id] * len(documents))
+            ids = vector_store.add_documents(docs, ids=[file_id] * len(docs))
 
         return {"message": "Documents added successfully", "ids": ids}
 
@@ -389,7 +432,7 @@ async def embed_local_file(
     document: StoreDocument, request: Request, entity_id: str = None
 ):
     # Check if the file exists
-    if not os.path.exists(document.filepath):
+    if not await aiofiles.os.path.exists(document.filepath):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ERROR_MESSAGES.FILE_NOT_FOUND,
@@ -401,10 +444,10 @@ async def embed_local_file(
         user_id = entity_id if entity_id else request.state.user.get("id")
 
     try:
-        loader, known_type = get_loader(
+        loader, known_type, _ = get_loader(
             document.filename, document.file_content_type, document.filepath
         )
-        data = loader.load()
+        data = await run_in_executor(None, loader.load)
         result = await store_data_in_vector_db(data, document.file_id, user_id)
 
         if result:
@@ -433,6 +476,15 @@ async def embed_local_file(
             )
 
 
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024  # 1 MB
+
+
+def save_upload_file(source: BinaryIO, destination: str):
+    # One blocking copy with a large buffer instead of awaiting each 64 KB chunk
+    with open(destination, "wb") as temp_file:
+        copyfileobj(source, temp_file, length=UPLOAD_COPY_BUFFER_SIZE)
+
+
 @app.post("/embed")
 async def embed_file(
     request: Request,
@@ -453,10 +505,7 @@ async def embed_file(
     temp_file_path = os.path.join(RAG_UPLOAD_DIR, user_id, file.filename)
 
     try:
-        async with aiofiles.open(temp_file_path, "wb") as temp_file:
-            chunk_size = 64 * 1024  # 64 KB
-            while content := await file.read(chunk_size):
-                await temp_file.write(content)
+        await run_in_executor(None, save_upload_file, file.file, temp_file_path)
     except Exception as e:
         logger.error(
             "Failed to save uploaded file | Path: %s | Error: %s | Traceback: %s",
@@ -473,7 +522,7 @@ async def embed_file(
         loader, known_type, file_ext = get_loader(
             file.filename, file.content_type, temp_file_path
         )
-        data = loader.load()
+        data = await run_in_executor(None, loader.load)
         result = await store_data_in_vector_db(
             data=data, file_id=file_id, user_id=user_id, clean_content=file_ext == "pdf"
         )
@@ -532,14 +581,15 @@ async def load_document_context(id: str):
     ids = [id]
     try:
         if isinstance(vector_store, AsyncPgVector):
-            existing_ids = await vector_store.get_all_ids()
-            documents = await vector_store.get_documents_by_ids(ids)
+            existing_ids, documents = await asyncio.gather(
+                vector_store.get_all_ids(), vector_store.get_documents_by_ids(ids)
+            )
         else:
             existing_ids = vector_store.get_all_ids()
             documents = vector_store.get_documents_by_ids(ids)
 
         # Ensure the requested id exists
-        if not all(id in existing_ids for id in ids):
+        if not set(ids).issubset(existing_ids):
             raise HTTPException(
                 status_code=404, detail="The specified file_id was not found"
             )
@@ -579,8 +629,9 @@ async def embed_file_upload(
         user_id = entity_id if entity_id else request.state.user.get("id")
 
     try:
-        with open(temp_file_path, "wb") as temp_file:
-            copyfileobj(uploaded_file.file, temp_file)
+        await run_in_executor(
+            None, save_upload_file, uploaded_file.file, temp_file_path
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -588,11 +639,11 @@ async def embed_file_upload(
         )
 
     try:
-        loader, known_type = get_loader(
+        loader, known_type, _ = get_loader(
             uploaded_file.filename, uploaded_file.content_type, temp_file_path
         )
 
-        data = loader.load()
+        data = await run_in_executor(None, loader.load)
         result = await store_data_in_vector_db(data, file_id, user_id)
 
         if not result:
@@ -621,7 +672,7 @@ async def embed_file_upload(
 async def query_embeddings_by_file_ids(body: QueryMultipleBody):
     try:
         # Get the embedding of the query text
-        embedding = vector_store.embedding_function.embed_query(body.query)
+        embedding = await run_in_executor(None, get_cached_query_embedding, body.query)
 
         # Perform similarity search with the query embedding and filter by the file_ids in metadata
         if isinstance(vector_store, AsyncPgVector):
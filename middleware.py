@@ -1,27 +1,33 @@
 import os
+import time
+from functools import lru_cache
 from fastapi import Request
-from datetime import datetime, timezone
 from fastapi.responses import JSONResponse
 from config import logger
 
 import jwt
-from jwt import PyJWTError
+from jwt import ExpiredSignatureError, PyJWTError
+
+JWT_SECRET = os.getenv("JWT_SECRET")
+UNAUTHENTICATED_PATHS = frozenset({"/docs", "/openapi.json", "/health"})
+BEARER_PREFIX = "Bearer "
+
+
+@lru_cache(maxsize=2048)
+def _decode_token(token: str, jwt_secret: str) -> dict:
+    return jwt.decode(token, jwt_secret, algorithms=["HS256"])
 
 
 async def security_middleware(request: Request, call_next):
-    async def next_middleware_call():
+    if request.url.path in UNAUTHENTICATED_PATHS:
         return await call_next(request)
 
-    if request.url.path in {"/docs", "/openapi.json", "/health"}:
-        return await next_middleware_call()
-
-    jwt_secret = os.getenv("JWT_SECRET")
-    if not jwt_secret:
+    if not JWT_SECRET:
         logger.warn("JWT_SECRET not found in environment variables")
-        return await next_middleware_call()
+        return await call_next(request)
 
     authorization = request.headers.get("Authorization")
-    if not authorization or not authorization.startswith("Bearer "):
+    if not authorization or not authorization.startswith(BEARER_PREFIX):
         logger.info(
             f"Unauthorized request with missing or invalid Authorization header to: {request.url.path}"
         )
@@ -30,22 +36,20 @@ async def security_middleware(request: Request, call_next):
             content={"detail": "Missing or invalid Authorization header"},
         )
 
-    token = authorization.split(" ")[1]
+    token = authorization[len(BEARER_PREFIX) :]
     try:
-        payload = jwt.decode(token, jwt_secret, algorithms=["HS256"])
+        payload = _decode_token(token, JWT_SECRET)
+        # PyJWT validates `exp` when decoding; cached payloads need the same check
         exp_timestamp = payload.get("exp")
-        if exp_timestamp and datetime.now(tz=timezone.utc) > datetime.fromtimestamp(
-            exp_timestamp, tz=timezone.utc
-        ):
-            logger.info(
-                f"Unauthorized request with expired token to: {request.url.path}"
-            )
-            return JSONResponse(
-                status_code=401, content={"detail": "Token has expired"}
-            )
-
-        request.state.user = payload
+        if exp_timestamp is not None and time.time() >= exp_timestamp:
+            raise ExpiredSignatureError("Signature has expired")
+
+        # Copy so handlers can't mutate the cached payload shared by this token
+        request.state.user = dict(payload)
         logger.debug(f"{request.url.path} - {payload}")
+    except ExpiredSignatureError:
+        logger.info(f"Unauthorized request with expired token to: {request.url.path}")
+        return JSONResponse(status_code=401, content={"detail": "Token has expired"})
     except PyJWTError as e:
         logger.info(
             f"Unauthorized request with invalid token to: {request.url.path}, reason: {str(e)}"
@@ -54,4 +58,4 @@ async def security_middleware(request: Request, call_next):
             status_code=401, content={"detail": f"Invalid token: {str(e)}"}
         )
 
-    return await next_middleware_call()
+    return await call_next(request)
@@ -1,8 +1,19 @@
 import hashlib
 from enum import Enum
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
+DIGEST_SLICE_SIZE = 64 * 1024
+
+
+def generate_digest(page_content: str):
+    hash_obj = hashlib.blake2b(digest_size=16)
+    # Encode in slices so large contents are never copied to bytes whole
+    for start in range(0, len(page_content), DIGEST_SLICE_SIZE):
+        end = start + DIGEST_SLICE_SIZE
+        hash_obj.update(page_content[start:end].encode())
+    return hash_obj.hexdigest()
+
 
 class DocumentResponse(BaseModel):
     page_content: str
@@ -14,8 +25,7 @@ class DocumentModel(BaseModel):
     metadata: Optional[dict] = {}
 
     def generate_digest(self):
-        hash_obj = hashlib.md5(self.page_content.encode())
-        return hash_obj.hexdigest()
+        return generate_digest(self.page_content)
 
 
 class StoreDocument(BaseModel):
@@ -39,5 +49,5 @@ class CleanupMethod(str, Enum):
 
 class QueryMultipleBody(BaseModel):
     query: str
-    file_ids: List[str]
+    file_ids: List[str] = Field(..., min_length=1)
     k: int = 4
@@ -1,15 +1,41 @@
 import logging
+import threading
 from pymongo import MongoClient
 from pymongo.errors import PyMongoError
+from langchain_core.runnables.config import run_in_executor
 from config import ATLAS_MONGO_DB_URI
 
 logger = logging.getLogger(__name__)
 
 
+class MongoDatabase:
+    client = None
+    # get_client runs in executor threads; don't let concurrent probes race
+    _client_lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls) -> MongoClient:
+        with cls._client_lock:
+            if cls.client is None:
+                cls.client = MongoClient(
+                    ATLAS_MONGO_DB_URI, serverSelectionTimeoutMS=2000, maxPoolSize=4
+                )
+        return cls.client
+
+    @classmethod
+    def close_client(cls):
+        if cls.client is not None:
+            cls.client.close()
+            cls.client = None
+
+
 async def mongo_health_check() -> bool:
     try:
-        client = MongoClient(ATLAS_MONGO_DB_URI)
-        client.admin.command("ping")
+        # pymongo is synchronous, and building the client resolves SRV/TXT
+        # records for mongodb+srv URIs, so keep both off the event loop
+        await run_in_executor(
+            None, lambda: MongoDatabase.get_client().admin.command("ping")
+        )
         return True
     except PyMongoError as e:
         logger.error(f"MongoDB health check failed: {e}")
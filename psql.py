@@ -1,6 +1,7 @@
 # db.py
+import time
 import asyncpg
-from config import DSN, logger
+from config import DSN, POSTGRES_POOL_MIN_SIZE, POSTGRES_POOL_MAX_SIZE, logger
 
 
 class PSQLDatabase:
@@ -9,7 +10,14 @@ class PSQLDatabase:
     @classmethod
     async def get_pool(cls):
         if cls.pool is None:
-            cls.pool = await asyncpg.create_pool(dsn=DSN)
+            # create_pool opens `min_size` connections before returning, so
+            # the first queries don't pay for the connection handshake
+            cls.pool = await asyncpg.create_pool(
+                dsn=DSN,
+                min_size=POSTGRES_POOL_MIN_SIZE,
+                max_size=POSTGRES_POOL_MAX_SIZE,
+                init=_prime_health_check,
+            )
         return cls.pool
 
     @classmethod
@@ -19,45 +27,98 @@ class PSQLDatabase:
             cls.pool = None
 
 
+# Arbitrary constant shared by every process that runs the index build
+CUSTOM_ID_INDEX_LOCK_ID = 7_261_675_001
+
+
 async def ensure_custom_id_index_on_embedding():
     table_name = "langchain_pg_embedding"
     column_name = "custom_id"
     # You might want to standardize the index naming convention
     index_name = f"idx_{table_name}_{column_name}"
 
-    pool = await PSQLDatabase.get_pool()
-    async with pool.acquire() as conn:
-        # Check if the index exists
-        index_exists = await check_index_exists(conn, index_name)
-
-        if not index_exists:
-            # If the index does not exist, create it
-            await conn.execute(f"""
-                CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({column_name});
-            """)
-            logger.debug(f"Created index '{index_name}' on '{table_name}({column_name})'")
-        else:
-            logger.debug(f"Index '{index_name}' already exists on '{table_name}({column_name})'")
-
-
-async def check_index_exists(conn, index_name: str) -> bool:
-    # Adjust the SQL query if necessary
-    result = await conn.fetchval("""
-        SELECT EXISTS (
-            SELECT FROM pg_class c
-            JOIN pg_namespace n ON n.oid = c.relnamespace
-            WHERE  c.relname = $1 AND n.nspname = 'public' -- Adjust schema if necessary
-        );
-    """, index_name)
-    return result
+    try:
+        pool = await PSQLDatabase.get_pool()
+        async with pool.acquire() as conn:
+            # An index being built concurrently also reads as invalid, so only
+            # one replica/worker may inspect and (re)build it at a time
+            locked = await conn.fetchval(
+                "SELECT pg_try_advisory_lock($1)", CUSTOM_ID_INDEX_LOCK_ID
+            )
+            if not locked:
+                logger.debug(
+                    f"Another process is ensuring index '{index_name}', skipping"
+                )
+                return
+
+            try:
+                await _ensure_index(conn, table_name, column_name, index_name)
+            finally:
+                await conn.fetchval(
+                    "SELECT pg_advisory_unlock($1)", CUSTOM_ID_INDEX_LOCK_ID
+                )
+    except Exception as e:
+        logger.error(f"Failed to ensure index '{index_name}': {e}")
+
+
+async def _ensure_index(conn, table_name: str, column_name: str, index_name: str):
+    # NULL if missing, false if a concurrent build failed or was interrupted
+    index_valid = await conn.fetchval(
+        """
+        SELECT i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relname = $1 AND n.nspname = 'public'
+        """,
+        index_name,
+    )
+    if index_valid:
+        logger.debug(
+            f"Index '{index_name}' already exists on '{table_name}({column_name})'"
+        )
+        return
+
+    # An invalid index would be skipped by IF NOT EXISTS forever
+    if index_valid is False:
+        logger.warning(f"Dropping invalid index '{index_name}' to rebuild it")
+        await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};")
+
+    # CONCURRENTLY avoids blocking writes while a large table is indexed.
+    # It must not run inside a transaction block.
+    await conn.execute(
+        f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} ({column_name});
+    """
+    )
+    logger.debug(f"Created index '{index_name}' on '{table_name}({column_name})'")
+
+
+HEALTH_CHECK_QUERY = "SELECT 1"
+HEALTH_CHECK_CACHE_SECONDS = 1.0
+_last_health_check = (float("-inf"), False)
+
+
+async def _prime_health_check(conn):
+    # Runs once per new connection, leaving the probe in its statement cache
+    await conn.fetchval(HEALTH_CHECK_QUERY)
 
 
 async def pg_health_check() -> bool:
+    global _last_health_check
+    checked_at, healthy = _last_health_check
+    now = time.monotonic()
+    # Serve bursts of probes from the last result instead of hitting Postgres
+    if now - checked_at < HEALTH_CHECK_CACHE_SECONDS:
+        return healthy
+
     try:
         pool = await PSQLDatabase.get_pool()
-        async with pool.acquire() as conn:
-            await conn.fetchval("SELECT 1")
-        return True
+        await pool.fetchval(HEALTH_CHECK_QUERY)
+        healthy = True
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return False
+        healthy = False
+
+    _last_health_check = (now, healthy)
+    return healthy
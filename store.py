@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from langchain_mongodb import MongoDBAtlasVectorSearch
 from langchain_core.embeddings import Embeddings
 from typing import (
+    Iterable,
     List,
     Optional,
     Tuple,
@@ -17,22 +18,50 @@ import copy
 
 class ExtendedPgVector(PGVector):
 
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        # Embed each distinct chunk only once; repeated content shares a vector
+        unique_texts = list(dict.fromkeys(texts))
+        unique_embeddings = self.embedding_function.embed_documents(unique_texts)
+        embeddings_by_text = dict(zip(unique_texts, unique_embeddings))
+        return self.add_embeddings(
+            texts=texts,
+            embeddings=[embeddings_by_text[text] for text in texts],
+            metadatas=metadatas,
+            ids=ids,
+            **kwargs,
+        )
+
     def get_all_ids(self) -> list[str]:
         with Session(self._bind) as session:
-            results = session.query(self.EmbeddingStore.custom_id).all()
-            return [result[0] for result in results if result[0] is not None]
+            results = (
+                session.query(self.EmbeddingStore.custom_id)
+                .filter(self.EmbeddingStore.custom_id.isnot(None))
+                .distinct()
+                .all()
+            )
+            return [result[0] for result in results]
 
     def get_documents_by_ids(self, ids: list[str]) -> list[Document]:
         with Session(self._bind) as session:
+            # Only load the columns needed to build the documents; the
+            # embedding vector is never returned and is the widest column.
             results = (
-                session.query(self.EmbeddingStore)
+                session.query(
+                    self.EmbeddingStore.document, self.EmbeddingStore.cmetadata
+                )
                 .filter(self.EmbeddingStore.custom_id.in_(ids))
                 .all()
             )
             return [
-                Document(page_content=result.document, metadata=result.cmetadata or {})
-                for result in results
-                if result.custom_id in ids
+                Document(page_content=document, metadata=cmetadata or {})
+                for document, cmetadata in results
             ]
 
     def _delete_multiple(